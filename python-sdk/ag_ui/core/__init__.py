@@ -9,10 +9,15 @@ from ag_ui.core.events import (
     TextMessageContentEvent,
     TextMessageEndEvent,
     TextMessageChunkEvent,
+    ThinkingTextMessageStartEvent,
+    ThinkingTextMessageContentEvent,
+    ThinkingTextMessageEndEvent,
     ToolCallStartEvent,
     ToolCallArgsEvent,
     ToolCallEndEvent,
     ToolCallChunkEvent,
+    ThinkingStartEvent,
+    ThinkingEndEvent,
     StateSnapshotEvent,
     StateDeltaEvent,
     MessagesSnapshotEvent,
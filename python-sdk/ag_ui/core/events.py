@@ -248,10 +248,15 @@ Event = Annotated[
         TextMessageContentEvent,
         TextMessageEndEvent,
         TextMessageChunkEvent,
+        ThinkingTextMessageStartEvent,
+        ThinkingTextMessageContentEvent,
+        ThinkingTextMessageEndEvent,
         ToolCallStartEvent,
         ToolCallArgsEvent,
         ToolCallEndEvent,
         ToolCallChunkEvent,
+        ThinkingStartEvent,
+        ThinkingEndEvent,
         StateSnapshotEvent,
         StateDeltaEvent,
         MessagesSnapshotEvent,
@@ -1,10 +1,30 @@
 """
 This module contains event encoder classes for the AG-UI Python SDK.
 """
-from ag_ui.core.events import BaseEvent
+from typing import Iterable, Iterator, Union
+
+from pydantic import TypeAdapter
+
+from ag_ui.core.events import BaseEvent, Event
 
 AGUI_MEDIA_TYPE = "application/vnd.ag-ui.event+proto"
 
+# SSE frame delimiters for the bytes encoding path
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+
+# Validator for any AG-UI event, dispatching on the "type" discriminator
+_EVENT_ADAPTER = TypeAdapter(Event)
+
+def _to_json(event: BaseEvent) -> bytes:
+    """
+    Serializes an event to JSON bytes with pydantic-core.
+    
+    Same output as model_dump_json(by_alias=True, exclude_none=True), but
+    without decoding the serializer's bytes to str.
+    """
+    return event.__pydantic_serializer__.to_json(event, by_alias=True, exclude_none=True)
+
 class EventEncoder:
     """
     SSE (Server-Sent Events) encoder for Agent User Interaction events.
@@ -52,7 +72,54 @@ class EventEncoder:
         Returns:
             str: Event formatted for SSE with 'data:' prefix and double newlines
         """
-        return f"data: {event.model_dump_json(by_alias=True, exclude_none=True)}\n\n"
+        return f"data: {_to_json(event).decode('utf-8')}\n\n"
+
+    def encode_bytes(self, event: BaseEvent) -> bytes:
+        """
+        Encodes an event into an SSE frame as UTF-8 bytes.
+        
+        Produces the same frame as encode(), serialized straight to bytes
+        so it can be written to a transport without a str round-trip.
+        
+        Args:
+            event: The event to encode
+            
+        Returns:
+            bytes: Event formatted for SSE with 'data:' prefix and double newlines
+        """
+        return b"".join((_SSE_PREFIX, _to_json(event), _SSE_SUFFIX))
+
+    def encode_iter(self, events: Iterable[BaseEvent]) -> Iterator[bytes]:
+        """
+        Lazily encodes a stream of events into SSE frames as UTF-8 bytes.
+        
+        Yields the same frames as encode_bytes(), one per event, and can be
+        passed as the body of a streaming HTTP response.
+        
+        Args:
+            events: The events to encode
+            
+        Yields:
+            bytes: One SSE frame per event
+        """
+        to_json, prefix, suffix, join = _to_json, _SSE_PREFIX, _SSE_SUFFIX, b"".join
+        for event in events:
+            yield join((prefix, to_json(event), suffix))
+
+    def encode_many(self, events: Iterable[BaseEvent]) -> bytes:
+        """
+        Encodes a batch of events into one chunk of consecutive SSE frames.
+        
+        SSE frames are self-delimiting, so the chunk can be written to the
+        stream in a single write. It is built with one final allocation.
+        
+        Args:
+            events: The events to encode
+            
+        Returns:
+            bytes: The SSE frames of all events, in order
+        """
+        return b"".join(self.encode_iter(events))
 
 
 class WebSocketEventEncoder:
@@ -91,7 +158,7 @@ class WebSocketEventEncoder:
         Returns:
             str: Encoded event as JSON string
         """
-        return event.model_dump_json(by_alias=True, exclude_none=True)
+        return self.encode_binary(event).decode('utf-8')
 
     def encode_binary(self, event: BaseEvent) -> bytes:
         """
@@ -104,8 +171,42 @@ class WebSocketEventEncoder:
         Returns:
             bytes: Encoded event as UTF-8 bytes
         """
-        json_str = self.encode(event)
-        return json_str.encode('utf-8')
+        return _to_json(event)
+
+    def encode_iter(self, events: Iterable[BaseEvent]) -> Iterator[bytes]:
+        """
+        Lazily encodes a stream of events as binary data.
+        
+        Yields the same payloads as encode_binary(). Send each one as its own
+        WebSocket message; the protocol carries one event per message.
+        
+        Args:
+            events: The events to encode
+            
+        Yields:
+            bytes: One encoded event per input event
+        """
+        to_json = _to_json
+        for event in events:
+            yield to_json(event)
+
+    def decode(self, data: Union[str, bytes]) -> BaseEvent:
+        """
+        Decodes a received WebSocket message into its event.
+        
+        The JSON is parsed and validated in one pass by pydantic-core; the
+        "type" field selects the event class.
+        
+        Args:
+            data: The message payload, as text or binary
+            
+        Returns:
+            BaseEvent: The decoded event
+            
+        Raises:
+            pydantic.ValidationError: If the payload is not a valid event
+        """
+        return _EVENT_ADAPTER.validate_json(data)
 
     def can_compress(self) -> bool:
         """
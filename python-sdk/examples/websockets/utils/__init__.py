@@ -1,26 +1,28 @@
 """
 Utility functions for WebSocket demo.
 """
+import logging
+from datetime import datetime
+
+logger = logging.getLogger("ag_ui_demo")
 
 def current_timestamp_ms():
     """Helper function to get current timestamp in milliseconds."""
-    from datetime import datetime
     return int(datetime.now().timestamp() * 1000)
 
 def log_state_summary(state, context=""):
     """Log a summary of the current state."""
-    import logging
-    logger = logging.getLogger("ag_ui_demo")
-    
+    # Nothing to walk when INFO is filtered out
+    if not logger.isEnabledFor(logging.INFO):
+        return
+
     if not state:
-        logger.info(f"{context}State is empty")
+        logger.info("%sState is empty", context)
         return
     
-    logger.info(f"{context}State summary:")
+    logger.info("%sState summary:", context)
     for key, value in state.items():
-        if isinstance(value, dict):
-            logger.info(f"  {key}: {len(value)} items")
-        elif isinstance(value, list):
-            logger.info(f"  {key}: {len(value)} items")
+        if isinstance(value, (dict, list)):
+            logger.info("  %s: %d items", key, len(value))
         else:
-            logger.info(f"  {key}: {type(value).__name__}")
+            logger.info("  %s: %s", key, type(value).__name__)
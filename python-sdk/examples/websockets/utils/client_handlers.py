@@ -4,242 +4,292 @@ WebSocket client handlers for AG-UI demo.
 import asyncio
 import json
 import logging
+from collections import Counter
 import websockets
 from ag_ui.core.events import EventType
 
+# Binary frames arrive as bytes and are parsed without a str decode first
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    from json import loads as json_loads
+
 logger = logging.getLogger("ag_ui_demo")
 
 async def ag_ui_client(secure=True):
     """Basic WebSocket client that connects and receives events."""
-    from .ssl_utils import get_websocket_uri
+    from .ssl_utils import get_websocket_uri, get_client_ssl_context
     
     uri = get_websocket_uri(secure)
-    logger.info(f"Connecting to {uri}...")
+    logger.info("Connecting to %s...", uri)
     
     try:
-        # Connect with SSL context if secure
-        if secure:
-            import ssl
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            async with websockets.connect(uri, ssl=ssl_context) as websocket:
-                await _handle_client_messages(websocket, "Basic Client")
-        else:
-            async with websockets.connect(uri) as websocket:
-                await _handle_client_messages(websocket, "Basic Client")
-                
+        # Connect with the shared SSL context if secure
+        ssl_context = get_client_ssl_context() if secure else None
+        async with websockets.connect(uri, ssl=ssl_context, compression=None) as websocket:
+            await _handle_client_messages(websocket, "Basic Client")
+
     except ConnectionRefusedError:
-        logger.error(f"Could not connect to WebSocket server at {uri}")
+        logger.error("Could not connect to WebSocket server at %s", uri)
         logger.info("Make sure the server is running with: python websocket_demo.py server")
     except Exception as e:
-        logger.error(f"Client error: {e}")
+        logger.error("Client error: %s", e)
 
 async def enhanced_ag_ui_client(secure=True):
     """Enhanced WebSocket client that handles all event types with detailed logging."""
-    from .ssl_utils import get_websocket_uri
+    from .ssl_utils import get_websocket_uri, get_client_ssl_context
     
     uri = get_websocket_uri(secure)
-    logger.info(f"Enhanced client connecting to {uri}...")
+    logger.info("Enhanced client connecting to %s...", uri)
     
     try:
-        # Connect with SSL context if secure
-        if secure:
-            import ssl
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            async with websockets.connect(uri, ssl=ssl_context) as websocket:
-                await _handle_enhanced_client_messages(websocket)
-        else:
-            async with websockets.connect(uri) as websocket:
-                await _handle_enhanced_client_messages(websocket)
-                
+        # Connect with the shared SSL context if secure
+        ssl_context = get_client_ssl_context() if secure else None
+        async with websockets.connect(uri, ssl=ssl_context, compression=None) as websocket:
+            await _handle_enhanced_client_messages(websocket)
+
     except ConnectionRefusedError:
-        logger.error(f"Could not connect to WebSocket server at {uri}")
+        logger.error("Could not connect to WebSocket server at %s", uri)
         logger.info("Make sure the comprehensive server is running with: python websocket_demo.py comprehensive_server")
     except Exception as e:
-        logger.error(f"Enhanced client error: {e}")
+        logger.error("Enhanced client error: %s", e)
 
 async def _handle_client_messages(websocket, client_type):
     """Handle incoming messages for basic client."""
     message_count = 0
     
-    logger.info(f"{client_type} connected! Listening for events...")
+    logger.info("%s connected! Listening for events...", client_type)
+    
+    # Resolve the compared type strings once instead of per message
+    run_started, run_finished = EventType.RUN_STARTED.value, EventType.RUN_FINISHED.value
+    text_start, text_content, text_end = (
+        EventType.TEXT_MESSAGE_START.value,
+        EventType.TEXT_MESSAGE_CONTENT.value,
+        EventType.TEXT_MESSAGE_END.value,
+    )
     
     async for message in websocket:
         try:
             message_count += 1
-            event_data = json.loads(message)
+            event_data = json_loads(message)
             event_type = event_data.get("type", "UNKNOWN")
             
-            logger.info(f"📨 [{message_count}] Received: {event_type}")
+            logger.info("📨 [%d] Received: %s", message_count, event_type)
             
             # Basic event handling
-            if event_type == EventType.RUN_STARTED:
+            if event_type == run_started:
                 thread_id = event_data.get("threadId", "unknown")
                 run_id = event_data.get("runId", "unknown")
-                logger.info(f"   🚀 Run started - Thread: {thread_id[:8]}..., Run: {run_id[:8]}...")
+                logger.info("   🚀 Run started - Thread: %s..., Run: %s...", thread_id[:8], run_id[:8])
                 
-            elif event_type == EventType.TEXT_MESSAGE_START:
+            elif event_type == text_start:
                 message_id = event_data.get("messageId", "unknown")
-                logger.info(f"   💬 Message starting - ID: {message_id[:8]}...")
+                logger.info("   💬 Message starting - ID: %s...", message_id[:8])
                 
-            elif event_type == EventType.TEXT_MESSAGE_CONTENT:
+            elif event_type == text_content:
                 delta = event_data.get("delta", "")
-                logger.info(f"   📝 Content: '{delta.strip()}'")
+                logger.info("   📝 Content: '%s'", delta.strip())
                 
-            elif event_type == EventType.TEXT_MESSAGE_END:
-                logger.info(f"   ✅ Message completed")
+            elif event_type == text_end:
+                logger.info("   ✅ Message completed")
                 
-            elif event_type == EventType.RUN_FINISHED:
-                logger.info(f"   🏁 Run finished")
+            elif event_type == run_finished:
+                logger.info("   🏁 Run finished")
                 
         except json.JSONDecodeError:
-            logger.error(f"Invalid JSON received: {message}")
+            logger.error("Invalid JSON received: %s", message)
         except Exception as e:
-            logger.error(f"Error processing message: {e}")
+            logger.error("Error processing message: %s", e)
+    
+    logger.info("%s received %d events total", client_type, message_count)
+
+class _StreamState:
+    """
+    Content accumulated across events by the enhanced client.
     
-    logger.info(f"{client_type} received {message_count} events total")
+    Streamed deltas are collected as lists and joined once when their
+    message or tool call ends, rather than grown with str += per delta.
+    """
+
+    def __init__(self):
+        self.message_parts = []
+        self.thinking_parts = []
+        self.tool_args_parts = []
+
+def _handle_run_started(event_data, state):
+    thread_id = event_data.get("threadId", "unknown")
+    run_id = event_data.get("runId", "unknown")
+    timestamp = event_data.get("timestamp", "unknown")
+    logger.info("   🚀 Run started")
+    logger.info("      Thread ID: %s", thread_id)
+    logger.info("      Run ID: %s", run_id)
+    logger.info("      Timestamp: %s", timestamp)
+
+def _handle_step_started(event_data, state):
+    step_name = event_data.get("stepName", "unknown")
+    logger.info("   📋 Step started: %s", step_name)
+
+def _handle_state_snapshot(event_data, state):
+    snapshot = event_data.get("snapshot", {})
+    logger.info("   📊 State snapshot received")
+    logger.info("      State keys: %s", list(snapshot.keys()))
+
+def _handle_messages_snapshot(event_data, state):
+    messages = event_data.get("messages", [])
+    logger.info("   💬 Messages snapshot: %d messages", len(messages))
+    for i, msg in enumerate(messages):
+        role = msg.get("role", "unknown")
+        content_preview = str(msg.get("content", ""))[:50]
+        logger.info("      [%d] %s: %s...", i + 1, role, content_preview)
+
+def _handle_thinking_start(event_data, state):
+    logger.info("   🤔 AI thinking process started")
+    state.thinking_parts = []
+
+def _handle_thinking_text_message_start(event_data, state):
+    message_id = event_data.get("messageId", "unknown")
+    logger.info("   💭 Thinking message started - ID: %s...", message_id[:8])
+
+def _handle_thinking_text_message_content(event_data, state):
+    delta = event_data.get("delta", "")
+    state.thinking_parts.append(delta)
+    logger.info("   🧠 Thinking: '%s'", delta.strip())
+
+def _handle_thinking_text_message_end(event_data, state):
+    logger.info("   ✅ Thinking message complete")
+    logger.info("      Full thought: '%s'", "".join(state.thinking_parts).strip())
+
+def _handle_thinking_end(event_data, state):
+    logger.info("   🎯 AI thinking process completed")
+
+def _handle_text_message_start(event_data, state):
+    message_id = event_data.get("messageId", "unknown")
+    logger.info("   💬 Assistant message starting - ID: %s...", message_id[:8])
+    state.message_parts = []
+
+def _handle_text_message_content(event_data, state):
+    delta = event_data.get("delta", "")
+    state.message_parts.append(delta)
+    logger.info("   📝 Content: '%s'", delta.strip())
+
+def _handle_text_message_end(event_data, state):
+    logger.info("   ✅ Assistant message completed")
+    logger.info("      Full message: '%s'", "".join(state.message_parts).strip())
+
+def _handle_tool_call_start(event_data, state):
+    tool_call_id = event_data.get("toolCallId", "unknown")
+    tool_name = event_data.get("toolCallName", "unknown")
+    logger.info("   🔧 Tool call started: %s", tool_name)
+    logger.info("      Tool call ID: %s", tool_call_id)
+    state.tool_args_parts = []
+
+def _handle_tool_call_args(event_data, state):
+    args_delta = event_data.get("delta", "")
+    state.tool_args_parts.append(args_delta)
+    logger.info("   🔧 Tool args: '%s'", args_delta)
+
+def _handle_tool_call_end(event_data, state):
+    logger.info("   ✅ Tool call completed")
+    logger.info("      Full args: %s", "".join(state.tool_args_parts))
+
+def _handle_state_delta(event_data, state):
+    delta = event_data.get("delta", [])
+    logger.info("   🔄 State delta: %d operations", len(delta))
+    for op in delta:
+        logger.info("      %s %s", op.get('op', 'unknown'), op.get('path', 'unknown'))
+
+def _handle_raw(event_data, state):
+    logger.info("   📡 Raw event from %s", event_data.get("source", "unknown"))
+    # Skip the payload walk entirely when INFO is filtered out
+    raw_event = event_data.get("event")
+    if isinstance(raw_event, dict) and logger.isEnabledFor(logging.INFO):
+        for key, value in raw_event.items():
+            logger.info("      %s: %s", key, value)
+
+def _handle_custom(event_data, state):
+    logger.info("   🎛️ Custom event: %s", event_data.get("name", "unknown"))
+    value = event_data.get("value")
+    if isinstance(value, dict) and logger.isEnabledFor(logging.INFO):
+        for key, item in value.items():
+            logger.info("      %s: %s", key, item)
+
+def _handle_step_finished(event_data, state):
+    step_name = event_data.get("stepName", "unknown")
+    logger.info("   ✅ Step completed: %s", step_name)
+
+def _handle_run_finished(event_data, state):
+    logger.info("   🏁 Run finished")
+
+def _handle_run_error(event_data, state):
+    error = event_data.get("message", "unknown")
+    error_code = event_data.get("code") or "unknown"
+    logger.error("   ❌ Run error: %s - %s", error_code, error)
+
+def _log_unknown(event_type):
+    logger.info("   ❓ Unhandled event type: %s", event_type)
+
+# Enhanced client handlers, keyed by the raw "type" string of the event
+HANDLERS = {
+    EventType.RUN_STARTED.value: _handle_run_started,
+    EventType.STEP_STARTED.value: _handle_step_started,
+    EventType.STATE_SNAPSHOT.value: _handle_state_snapshot,
+    EventType.MESSAGES_SNAPSHOT.value: _handle_messages_snapshot,
+    EventType.THINKING_START.value: _handle_thinking_start,
+    EventType.THINKING_TEXT_MESSAGE_START.value: _handle_thinking_text_message_start,
+    EventType.THINKING_TEXT_MESSAGE_CONTENT.value: _handle_thinking_text_message_content,
+    EventType.THINKING_TEXT_MESSAGE_END.value: _handle_thinking_text_message_end,
+    EventType.THINKING_END.value: _handle_thinking_end,
+    EventType.TEXT_MESSAGE_START.value: _handle_text_message_start,
+    EventType.TEXT_MESSAGE_CONTENT.value: _handle_text_message_content,
+    EventType.TEXT_MESSAGE_END.value: _handle_text_message_end,
+    EventType.TOOL_CALL_START.value: _handle_tool_call_start,
+    EventType.TOOL_CALL_ARGS.value: _handle_tool_call_args,
+    EventType.TOOL_CALL_END.value: _handle_tool_call_end,
+    EventType.STATE_DELTA.value: _handle_state_delta,
+    EventType.RAW.value: _handle_raw,
+    EventType.CUSTOM.value: _handle_custom,
+    EventType.STEP_FINISHED.value: _handle_step_finished,
+    EventType.RUN_FINISHED.value: _handle_run_finished,
+    EventType.RUN_ERROR.value: _handle_run_error,
+}
 
 async def _handle_enhanced_client_messages(websocket):
     """Handle incoming messages for enhanced client with comprehensive event handling."""
     message_count = 0
-    event_counts = {}
-    current_message_content = ""
-    current_thinking_content = ""
-    current_tool_args = ""
+    event_counts = Counter()
+    state = _StreamState()
     
     logger.info("🔍 Enhanced client connected! Listening for ALL event types...")
     
     async for message in websocket:
         try:
             message_count += 1
-            event_data = json.loads(message)
+            event_data = json_loads(message)
             event_type = event_data.get("type", "UNKNOWN")
             
             # Track event type counts
-            event_counts[event_type] = event_counts.get(event_type, 0) + 1
+            event_counts[event_type] += 1
             
-            logger.info(f"📨 [{message_count}] Received: {event_type} (#{event_counts[event_type]})")
+            logger.info("📨 [%d] Received: %s (#%d)", message_count, event_type, event_counts[event_type])
             
-            # Enhanced event handling with detailed logging
-            if event_type == EventType.RUN_STARTED:
-                thread_id = event_data.get("threadId", "unknown")
-                run_id = event_data.get("runId", "unknown")
-                timestamp = event_data.get("timestamp", "unknown")
-                logger.info(f"   🚀 Run started")
-                logger.info(f"      Thread ID: {thread_id}")
-                logger.info(f"      Run ID: {run_id}")
-                logger.info(f"      Timestamp: {timestamp}")
-                
-            elif event_type == EventType.STEP_STARTED:
-                step_name = event_data.get("stepName", "unknown")
-                logger.info(f"   📋 Step started: {step_name}")
-                
-            elif event_type == EventType.STATE_SNAPSHOT:
-                state = event_data.get("state", {})
-                logger.info(f"   📊 State snapshot received")
-                logger.info(f"      State keys: {list(state.keys())}")
-                
-            elif event_type == EventType.MESSAGES_SNAPSHOT:
-                messages = event_data.get("messages", [])
-                logger.info(f"   💬 Messages snapshot: {len(messages)} messages")
-                for i, msg in enumerate(messages):
-                    role = msg.get("role", "unknown")
-                    content_preview = str(msg.get("content", ""))[:50]
-                    logger.info(f"      [{i+1}] {role}: {content_preview}...")
-                    
-            elif event_type == EventType.THINKING_START:
-                logger.info(f"   🤔 AI thinking process started")
-                current_thinking_content = ""
-                
-            elif event_type == EventType.THINKING_TEXT_MESSAGE_START:
-                message_id = event_data.get("messageId", "unknown")
-                logger.info(f"   💭 Thinking message started - ID: {message_id[:8]}...")
-                
-            elif event_type == EventType.THINKING_TEXT_MESSAGE_CONTENT:
-                delta = event_data.get("delta", "")
-                current_thinking_content += delta
-                logger.info(f"   🧠 Thinking: '{delta.strip()}'")
-                
-            elif event_type == EventType.THINKING_TEXT_MESSAGE_END:
-                logger.info(f"   ✅ Thinking message complete")
-                logger.info(f"      Full thought: '{current_thinking_content.strip()}'")
-                
-            elif event_type == EventType.THINKING_END:
-                logger.info(f"   🎯 AI thinking process completed")
-                
-            elif event_type == EventType.TEXT_MESSAGE_START:
-                message_id = event_data.get("messageId", "unknown")
-                logger.info(f"   💬 Assistant message starting - ID: {message_id[:8]}...")
-                current_message_content = ""
-                
-            elif event_type == EventType.TEXT_MESSAGE_CONTENT:
-                delta = event_data.get("delta", "")
-                current_message_content += delta
-                logger.info(f"   📝 Content: '{delta.strip()}'")
-                
-            elif event_type == EventType.TEXT_MESSAGE_END:
-                logger.info(f"   ✅ Assistant message completed")
-                logger.info(f"      Full message: '{current_message_content.strip()}'")
-                
-            elif event_type == EventType.TOOL_CALL_START:
-                tool_call_id = event_data.get("toolCallId", "unknown")
-                tool_name = event_data.get("toolName", "unknown")
-                logger.info(f"   🔧 Tool call started: {tool_name}")
-                logger.info(f"      Tool call ID: {tool_call_id}")
-                current_tool_args = ""
-                
-            elif event_type == EventType.TOOL_CALL_ARGS:
-                args_delta = event_data.get("argsDelta", "")
-                current_tool_args += args_delta
-                logger.info(f"   🔧 Tool args: '{args_delta}'")
-                
-            elif event_type == EventType.TOOL_CALL_END:
-                logger.info(f"   ✅ Tool call completed")
-                logger.info(f"      Full args: {current_tool_args}")
-                
-            elif event_type == EventType.STATE_DELTA:
-                delta = event_data.get("delta", [])
-                logger.info(f"   🔄 State delta: {len(delta)} operations")
-                for op in delta:
-                    logger.info(f"      {op.get('op', 'unknown')} {op.get('path', 'unknown')}")
-                    
-            elif event_type == EventType.RAW:
-                source = event_data.get("source", "unknown")
-                data = event_data.get("data", {})
-                logger.info(f"   📡 Raw event from {source}")
-                logger.info(f"      Data keys: {list(data.keys())}")
-                
-            elif event_type == EventType.CUSTOM:
-                event_subtype = event_data.get("eventType", "unknown")
-                data = event_data.get("data", {})
-                logger.info(f"   🎛️ Custom event: {event_subtype}")
-                logger.info(f"      Data keys: {list(data.keys())}")
-                
-            elif event_type == EventType.STEP_FINISHED:
-                step_name = event_data.get("stepName", "unknown")
-                logger.info(f"   ✅ Step completed: {step_name}")
-                
-            elif event_type == EventType.RUN_FINISHED:
-                logger.info(f"   🏁 Run finished")
-                
-            elif event_type == EventType.RUN_ERROR:
-                error = event_data.get("error", "unknown")
-                error_code = event_data.get("errorCode", "unknown")
-                logger.error(f"   ❌ Run error: {error_code} - {error}")
-                
+            # Dispatch on the raw type string; no EventType lookup per message
+            handler = HANDLERS.get(event_type)
+            if handler is not None:
+                handler(event_data, state)
             else:
-                logger.info(f"   ❓ Unhandled event type: {event_type}")
+                _log_unknown(event_type)
                 
         except json.JSONDecodeError:
-            logger.error(f"Invalid JSON received: {message}")
+            logger.error("Invalid JSON received: %s", message)
         except Exception as e:
-            logger.error(f"Error processing message: {e}")
+            logger.error("Error processing message: %s", e)
+        
+        # recv() doesn't suspend while frames are buffered; yield so other
+        # tasks (e.g. the server in the combined demo) run during a burst
+        await asyncio.sleep(0)
     
     logger.info("🔍 Enhanced client session completed!")
-    logger.info(f"📊 Event Summary:")
-    logger.info(f"   Total events: {message_count}")
+    logger.info("📊 Event Summary:")
+    logger.info("   Total events: %d", message_count)
     for event_type, count in sorted(event_counts.items()):
-        logger.info(f"   {event_type}: {count}")
+        logger.info("   %s: %d", event_type, count)
@@ -2,433 +2,537 @@
 WebSocket server handlers for AG-UI demo.
 """
 import asyncio
+import contextlib
+import itertools
+import os
+import socket
 import uuid
-import copy
 import logging
 import websockets
 from ag_ui.encoder import WebSocketEventEncoder
 from ag_ui.core.events import *
-from .sample_data import create_sample_messages, create_sample_tools, create_sample_context, create_sample_state
+from .sample_data import create_sample_messages, create_sample_state
 from .state_utils import create_progressive_state_changes, apply_json_patch
 from . import current_timestamp_ms, log_state_summary
 
 logger = logging.getLogger("ag_ui_demo")
 
+# Seconds between sends of the comprehensive demo; 0 sends without pausing.
+# A group sent by _send_group() goes out as one burst and is paced as a whole.
+PACING = float(os.getenv("AGUI_DEMO_PACING", "0"))
+
+# Run ids are a counter plus a random per-process suffix, so generating one
+# costs no os.urandom() call. They are unique strings, not RFC 4122 UUIDs.
+# The counter comes first so that truncated ids in the logs stay distinct.
+_ID_SUFFIX = uuid.uuid4().hex[:24]
+_ID_COUNTER = itertools.count()
+
+def _fast_id():
+    """Return a new process-unique id for a demo run."""
+    return f"{next(_ID_COUNTER):08x}{_ID_SUFFIX}"
+
+# Placeholders the events are built with; _precode turns each into the
+# bytes %-format slot named alongside it.
+_THREAD_ID = "__THREAD_ID__"
+_RUN_ID = "__RUN_ID__"
+_MESSAGE_ID = "__MESSAGE_ID__"
+_TOOL_CALL_ID = "__TOOL_CALL_ID__"
+_ID_SLOTS = (
+    (_THREAD_ID.encode(), b"%(thread_id)b"),
+    (_RUN_ID.encode(), b"%(run_id)b"),
+    (_MESSAGE_ID.encode(), b"%(message_id)b"),
+    (_TOOL_CALL_ID.encode(), b"%(tool_call_id)b"),
+)
+
+# Fixed script of the comprehensive demo
+_SAMPLE_MESSAGES = create_sample_messages()
+_THINKING_CONTENT = "".join([
+    "I need to check the weather for San Francisco. ",
+    "Let me use the weather tool to get current conditions. ",
+    "I'll make sure to provide temperature, conditions, and any relevant details."
+])
+_MESSAGE_CONTENT_PARTS = (
+    "I'll help you check the weather in San Francisco. ",
+    "Let me use the weather tool to get that information for you."
+)
+_TOOL_ARGS = "".join(['{"location": ', '"San Francisco, CA", ', '"unit": "fahrenheit"}'])
+_FINAL_CONTENT_PARTS = (
+    "Based on the weather data, ",
+    "it's currently 68°F in San Francisco ",
+    "with partly cloudy skies and 65% humidity. ",
+    "It's a pleasant day!"
+)
+_BASIC_CONTENT_PARTS = ("Hello! ", "This is a ", "streaming message ", "from the AG-UI ", "WebSocket demo.")
+
+# Shared by every connection: encoding is stateless, so there is nothing to
+# build per handler call
+ENCODER = WebSocketEventEncoder()
+
+def _precode(event):
+    """
+    Encode an event (built without a timestamp) as a bytes %-format template.
+    
+    Literal % signs are escaped, the id placeholders become named slots and
+    a timestamp slot is appended, so a frame is rendered with a single
+    ``template % values`` call (see _render_frame).
+    """
+    template = ENCODER.encode_binary(event)[:-1].replace(b"%", b"%%")
+    for placeholder, slot in _ID_SLOTS:
+        template = template.replace(placeholder, slot)
+    return template + b',"timestamp":%(timestamp)d}'
+
+def _precode_text_content(parts):
+    """Encode one TEXT_MESSAGE_CONTENT frame per streamed part of the message."""
+    return tuple(
+        _precode(TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT, message_id=_MESSAGE_ID, delta=part
+        ))
+        for part in parts
+    )
+
+def _precode_comprehensive_frames():
+    """
+    Encode every event of the comprehensive demo once.
+    
+    The script is the same for every connection, so the events are built
+    and serialized at import into templates with slots for the per-run ids
+    and the timestamp; _render_frame fills them in.
+    
+    Returns:
+        dict: Encoded frames by name (tuples of frames for streamed parts)
+    """
+    return {
+        "run_started": _precode(RunStartedEvent(
+            type=EventType.RUN_STARTED, thread_id=_THREAD_ID, run_id=_RUN_ID
+        )),
+        "step_started": _precode(StepStartedEvent(
+            type=EventType.STEP_STARTED, step_name="weather_query_processing"
+        )),
+        "state_snapshot": _precode(StateSnapshotEvent(
+            type=EventType.STATE_SNAPSHOT, snapshot=create_sample_state()
+        )),
+        "messages_snapshot": _precode(MessagesSnapshotEvent(
+            type=EventType.MESSAGES_SNAPSHOT, messages=_SAMPLE_MESSAGES
+        )),
+        "thinking_start": _precode(ThinkingStartEvent(type=EventType.THINKING_START)),
+        "thinking_text_start": _precode(ThinkingTextMessageStartEvent(
+            type=EventType.THINKING_TEXT_MESSAGE_START
+        )),
+        "thinking_content": _precode(ThinkingTextMessageContentEvent(
+            type=EventType.THINKING_TEXT_MESSAGE_CONTENT, delta=_THINKING_CONTENT
+        )),
+        "thinking_text_end": _precode(ThinkingTextMessageEndEvent(
+            type=EventType.THINKING_TEXT_MESSAGE_END
+        )),
+        "thinking_end": _precode(ThinkingEndEvent(type=EventType.THINKING_END)),
+        "text_start": _precode(TextMessageStartEvent(
+            type=EventType.TEXT_MESSAGE_START, message_id=_MESSAGE_ID, role="assistant"
+        )),
+        "text_content": _precode_text_content(_MESSAGE_CONTENT_PARTS),
+        "tool_call_start": _precode(ToolCallStartEvent(
+            type=EventType.TOOL_CALL_START, tool_call_id=_TOOL_CALL_ID, tool_call_name="get_weather"
+        )),
+        "tool_call_args": _precode(ToolCallArgsEvent(
+            type=EventType.TOOL_CALL_ARGS, tool_call_id=_TOOL_CALL_ID, delta=_TOOL_ARGS
+        )),
+        "state_deltas": tuple(
+            _precode(StateDeltaEvent(type=EventType.STATE_DELTA, delta=list(patch_operations)))
+            for patch_operations in create_progressive_state_changes()
+        ),
+        "tool_call_end": _precode(ToolCallEndEvent(
+            type=EventType.TOOL_CALL_END, tool_call_id=_TOOL_CALL_ID
+        )),
+        "final_content": _precode_text_content(_FINAL_CONTENT_PARTS),
+        "text_end": _precode(TextMessageEndEvent(
+            type=EventType.TEXT_MESSAGE_END, message_id=_MESSAGE_ID
+        )),
+        "raw": _precode(RawEvent(
+            type=EventType.RAW,
+            event={"system": "weather_service", "status": "completed", "response_time_ms": 245},
+            source="weather_api"
+        )),
+        "custom": _precode(CustomEvent(
+            type=EventType.CUSTOM,
+            name="weather_analysis_complete",
+            value={
+                "analysis": {
+                    "location": "San Francisco, CA",
+                    "weather_quality": "good",
+                    "recommendation": "Great day for outdoor activities"
+                },
+                "metadata": {
+                    "analysis_duration_ms": 150,
+                    "confidence": 0.95
+                }
+            }
+        )),
+        "step_finished": _precode(StepFinishedEvent(
+            type=EventType.STEP_FINISHED, step_name="weather_query_processing"
+        )),
+        "run_finished": _precode(RunFinishedEvent(
+            type=EventType.RUN_FINISHED, thread_id=_THREAD_ID, run_id=_RUN_ID
+        )),
+    }
+
+def _precode_basic_frames(frames):
+    """
+    Build the frames of the basic demo from the comprehensive ones.
+    
+    The basic demo sends a subset of the comprehensive events with its own
+    content parts, so it shares their templates instead of encoding them
+    a second time.
+    
+    Args:
+        frames: The frames from _precode_comprehensive_frames()
+        
+    Returns:
+        dict: Encoded frames by name (a tuple of frames for the content parts)
+    """
+    basic_frames = {
+        name: frames[name] for name in ("run_started", "text_start", "text_end", "run_finished")
+    }
+    basic_frames["text_content"] = _precode_text_content(_BASIC_CONTENT_PARTS)
+    return basic_frames
+
+PRECODED_FRAMES = _precode_comprehensive_frames()
+BASIC_FRAMES = _precode_basic_frames(PRECODED_FRAMES)
+
+def _run_values(**ids):
+    """
+    Build the per-run format mapping for _render_frame.
+    
+    Args:
+        **ids: Per-run ids by slot name (thread_id, run_id, ...)
+        
+    Returns:
+        dict: Bytes-keyed mapping with the encoded ids and a timestamp slot
+    """
+    values = {name.encode(): value.encode() for name, value in ids.items()}
+    values[b"timestamp"] = 0
+    return values
+
+def _render_frame(frame, values, timestamp):
+    """Fill the per-run ids and the timestamp of a pre-encoded frame template."""
+    values[b"timestamp"] = timestamp
+    return frame % values
+
+def _renderer(values):
+    """
+    Return a render(frame) function that fills frames for one run.
+    
+    Timestamps are the wall clock read once plus the loop's monotonic
+    clock, instead of a wall-clock read per event.
+    
+    Args:
+        values: The run's format mapping from _run_values()
+    """
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    base_ms = current_timestamp_ms()
+
+    def render(frame):
+        """Fill a pre-encoded frame for this run with the current timestamp."""
+        return _render_frame(frame, values, base_ms + int((loop.time() - start) * 1000))
+
+    return render
+
+@contextlib.contextmanager
+def _corked(websocket):
+    """
+    Hold back partial TCP segments while a group of frames is written.
+    
+    This is the TCP_CORK equivalent of Node's socket.cork()/uncork(): the
+    frames of a group leave in as few segments as possible once the cork is
+    removed. Without TCP_CORK (non-Linux), or once the connection is going
+    away, this is a no-op, so a disconnect surfaces as ConnectionClosed from
+    the send itself.
+    """
+    transport = websocket.transport
+    sock = transport.get_extra_info("socket")
+    if sock is None or not hasattr(socket, "TCP_CORK") or transport.is_closing():
+        yield
+        return
+
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 1)
+    except OSError:
+        # Socket closed under us (client just disconnected); send uncorked
+        yield
+        return
+
+    try:
+        yield
+    finally:
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 0)
+        except OSError:
+            pass  # Connection already gone
+
+async def _send_group(websocket, frames, render):
+    """Send a group of pre-encoded frames back-to-back, one message per event."""
+    # Render the whole batch up front so nothing but writes happens while corked
+    payloads = [render(frame) for frame in frames]
+    with _corked(websocket):
+        for payload in payloads:
+            await websocket.send(payload)
+
 async def comprehensive_ag_ui_server_handler(websocket):
     """Comprehensive server handler demonstrating all event types and parameters."""
-    logger.info(f"Client connected from {websocket.remote_address}")
+    logger.info("Client connected from %s", websocket.remote_address)
 
-    encoder = WebSocketEventEncoder()
+    frames = PRECODED_FRAMES
 
     # Generate IDs for the demo
-    thread_id = str(uuid.uuid4())
-    run_id = str(uuid.uuid4())
-    message_id = str(uuid.uuid4())
-    thinking_message_id = str(uuid.uuid4())
-    tool_call_id = str(uuid.uuid4())
+    thread_id = _fast_id()
+    run_id = _fast_id()
+    message_id = _fast_id()
+    tool_call_id = _fast_id()
+    run_values = _run_values(
+        thread_id=thread_id, run_id=run_id, message_id=message_id, tool_call_id=tool_call_id
+    )
     
     # Create sample data
-    sample_messages = create_sample_messages()
-    sample_tools = create_sample_tools()
-    sample_context = create_sample_context()
-    sample_state = create_sample_state()
     state_changes = create_progressive_state_changes()
     
-    # Track current state for demonstration
-    current_state = copy.deepcopy(sample_state)
+    # Track current state for demonstration (a fresh copy per connection,
+    # so it can be patched in place)
+    current_state = create_sample_state()
+
+    render = _renderer(run_values)
+
+    # Pace against absolute deadlines so the delays don't drift
+    loop = asyncio.get_running_loop()
+    deadline = loop.time()
+
+    async def pace():
+        """Wait until the next pacing deadline (no-op when PACING is 0)."""
+        nonlocal deadline
+        if PACING:
+            deadline += PACING
+            await asyncio.sleep(max(0, deadline - loop.time()))
 
     try:
         # 1. RUN_STARTED - Start of the interaction
         logger.info("=== SENDING RUN_STARTED EVENT ===")
-        run_started_event = RunStartedEvent(
-            type=EventType.RUN_STARTED, 
-            thread_id=thread_id, 
-            run_id=run_id,
-            timestamp=current_timestamp_ms()
-        )
-        await websocket.send(encoder.encode(run_started_event))
-        logger.info(f"Sent: {run_started_event.type}")
-        await asyncio.sleep(0.1)
+        await websocket.send(render(frames["run_started"]))
+        logger.info("Sent: %s", EventType.RUN_STARTED.value)
+        await pace()
 
         # 2. STEP_STARTED - Beginning of processing step
         logger.info("=== SENDING STEP_STARTED EVENT ===")
-        step_started_event = StepStartedEvent(
-            type=EventType.STEP_STARTED,
-            step_name="weather_query_processing",
-            timestamp=current_timestamp_ms()
-        )
-        await websocket.send(encoder.encode(step_started_event))
-        logger.info(f"Sent: {step_started_event.type}")
-        await asyncio.sleep(0.1)
+        await websocket.send(render(frames["step_started"]))
+        logger.info("Sent: %s", EventType.STEP_STARTED.value)
+        await pace()
 
         # 3. STATE_SNAPSHOT - Initial state
         logger.info("=== SENDING STATE_SNAPSHOT EVENT ===")
-        state_snapshot_event = StateSnapshotEvent(
-            type=EventType.STATE_SNAPSHOT,
-            snapshot=current_state,
-            timestamp=current_timestamp_ms()
-        )
-        await websocket.send(encoder.encode(state_snapshot_event))
-        logger.info(f"Sent: {state_snapshot_event.type}")
+        await websocket.send(render(frames["state_snapshot"]))
+        logger.info("Sent: %s", EventType.STATE_SNAPSHOT.value)
         log_state_summary(current_state, "Initial ")
-        await asyncio.sleep(0.1)
+        await pace()
 
         # 4. MESSAGES_SNAPSHOT - Current conversation
         logger.info("=== SENDING MESSAGES_SNAPSHOT EVENT ===")
-        messages_snapshot_event = MessagesSnapshotEvent(
-            type=EventType.MESSAGES_SNAPSHOT,
-            messages=sample_messages,
-            timestamp=current_timestamp_ms()
-        )
-        await websocket.send(encoder.encode(messages_snapshot_event))
-        logger.info(f"Sent: {messages_snapshot_event.type} with {len(sample_messages)} messages")
-        await asyncio.sleep(0.1)
+        await websocket.send(render(frames["messages_snapshot"]))
+        logger.info("Sent: %s with %d messages", EventType.MESSAGES_SNAPSHOT.value, len(_SAMPLE_MESSAGES))
+        await pace()
 
         # 5. THINKING_START - Begin reasoning process
         logger.info("=== SENDING THINKING_START EVENT ===")
-        thinking_start_event = ThinkingStartEvent(
-            type=EventType.THINKING_START,
-            timestamp=current_timestamp_ms()
-        )
-        await websocket.send(encoder.encode(thinking_start_event))
-        logger.info(f"Sent: {thinking_start_event.type}")
-        await asyncio.sleep(0.1)
+        await websocket.send(render(frames["thinking_start"]))
+        logger.info("Sent: %s", EventType.THINKING_START.value)
+        await pace()
 
         # 6. THINKING_TEXT_MESSAGE_START - Start of thinking content
         logger.info("=== SENDING THINKING_TEXT_MESSAGE_START EVENT ===")
-        thinking_text_start_event = ThinkingTextMessageStartEvent(
-            type=EventType.THINKING_TEXT_MESSAGE_START,
-            timestamp=current_timestamp_ms()
-        )
-        await websocket.send(encoder.encode(thinking_text_start_event))
-        logger.info(f"Sent: {thinking_text_start_event.type}")
-        await asyncio.sleep(0.1)
+        await websocket.send(render(frames["thinking_text_start"]))
+        logger.info("Sent: %s", EventType.THINKING_TEXT_MESSAGE_START.value)
+        await pace()
 
-        # 7. THINKING_TEXT_MESSAGE_CONTENT - Streaming thought process
-        thinking_content_parts = [
-            "I need to check the weather for San Francisco. ",
-            "Let me use the weather tool to get current conditions. ",
-            "I'll make sure to provide temperature, conditions, and any relevant details."
-        ]
-        
-        for i, content_part in enumerate(thinking_content_parts):
-            logger.info(f"=== SENDING THINKING_TEXT_MESSAGE_CONTENT EVENT {i+1}/3 ===")
-            thinking_content_event = ThinkingTextMessageContentEvent(
-                type=EventType.THINKING_TEXT_MESSAGE_CONTENT,
-                delta=content_part,
-                timestamp=current_timestamp_ms()
-            )
-            await websocket.send(encoder.encode(thinking_content_event))
-            logger.info(f"Sent: {thinking_content_event.type} - '{content_part.strip()}'")
-            await asyncio.sleep(0.1)
+        # 7. THINKING_TEXT_MESSAGE_CONTENT - Thought process, sent as one merged delta
+        logger.info("=== SENDING THINKING_TEXT_MESSAGE_CONTENT EVENT ===")
+        await websocket.send(render(frames["thinking_content"]))
+        logger.info("Sent: %s - '%s'", EventType.THINKING_TEXT_MESSAGE_CONTENT.value, _THINKING_CONTENT.strip())
+        await pace()
 
         # 8. THINKING_TEXT_MESSAGE_END - End of thinking content
         logger.info("=== SENDING THINKING_TEXT_MESSAGE_END EVENT ===")
-        thinking_text_end_event = ThinkingTextMessageEndEvent(
-            type=EventType.THINKING_TEXT_MESSAGE_END,
-            timestamp=current_timestamp_ms()
-        )
-        await websocket.send(encoder.encode(thinking_text_end_event))
-        logger.info(f"Sent: {thinking_text_end_event.type}")
-        await asyncio.sleep(0.1)
+        await websocket.send(render(frames["thinking_text_end"]))
+        logger.info("Sent: %s", EventType.THINKING_TEXT_MESSAGE_END.value)
+        await pace()
 
         # 9. THINKING_END - Complete reasoning process
         logger.info("=== SENDING THINKING_END EVENT ===")
-        thinking_end_event = ThinkingEndEvent(
-            type=EventType.THINKING_END,
-            timestamp=current_timestamp_ms()
-        )
-        await websocket.send(encoder.encode(thinking_end_event))
-        logger.info(f"Sent: {thinking_end_event.type}")
-        await asyncio.sleep(0.1)
+        await websocket.send(render(frames["thinking_end"]))
+        logger.info("Sent: %s", EventType.THINKING_END.value)
+        await pace()
 
         # 10. TEXT_MESSAGE_START - Begin assistant response
         logger.info("=== SENDING TEXT_MESSAGE_START EVENT ===")
-        text_start_event = TextMessageStartEvent(
-            type=EventType.TEXT_MESSAGE_START,
-            message_id=message_id,
-            role="assistant",
-            timestamp=current_timestamp_ms()
-        )
-        await websocket.send(encoder.encode(text_start_event))
-        logger.info(f"Sent: {text_start_event.type}")
-        await asyncio.sleep(0.1)
+        await websocket.send(render(frames["text_start"]))
+        logger.info("Sent: %s", EventType.TEXT_MESSAGE_START.value)
+        await pace()
 
-        # 11. TEXT_MESSAGE_CONTENT - Streaming message content
-        message_content_parts = [
-            "I'll help you check the weather in San Francisco. ",
-            "Let me use the weather tool to get that information for you."
-        ]
-
-        for i, content_part in enumerate(message_content_parts):
-            logger.info(f"=== SENDING TEXT_MESSAGE_CONTENT EVENT {i+1}/2 ===")
-            text_content_event = TextMessageContentEvent(
-                type=EventType.TEXT_MESSAGE_CONTENT,
-                message_id=message_id,
-                delta=content_part,
-                timestamp=current_timestamp_ms()
-            )
-            await websocket.send(encoder.encode(text_content_event))
-            logger.info(f"Sent: {text_content_event.type} - '{content_part.strip()}'")
-            await asyncio.sleep(0.1)
+        # 11. TEXT_MESSAGE_CONTENT - Streaming message content, sent as one group
+        logger.info("=== SENDING %d TEXT_MESSAGE_CONTENT EVENTS ===", len(_MESSAGE_CONTENT_PARTS))
+        await _send_group(websocket, frames["text_content"], render)
+        for content_part in _MESSAGE_CONTENT_PARTS:
+            logger.info("Sent: %s - '%s'", EventType.TEXT_MESSAGE_CONTENT.value, content_part.strip())
+        await pace()
 
         # 12. TOOL_CALL_START - Begin tool execution
         logger.info("=== SENDING TOOL_CALL_START EVENT ===")
-        tool_call_start_event = ToolCallStartEvent(
-            type=EventType.TOOL_CALL_START,
-            tool_call_id=tool_call_id,
-            tool_call_name="get_weather",
-            timestamp=current_timestamp_ms()
-        )
-        await websocket.send(encoder.encode(tool_call_start_event))
-        logger.info(f"Sent: {tool_call_start_event.type}")
-        await asyncio.sleep(0.1)
-
-        # 13. TOOL_CALL_ARGS - Streaming tool arguments
-        args_parts = ['{"location": ', '"San Francisco, CA", ', '"unit": "fahrenheit"}']
-        
-        for i, args_part in enumerate(args_parts):
-            logger.info(f"=== SENDING TOOL_CALL_ARGS EVENT {i+1}/3 ===")
-            tool_args_event = ToolCallArgsEvent(
-                type=EventType.TOOL_CALL_ARGS,
-                tool_call_id=tool_call_id,
-                delta=args_part,
-                timestamp=current_timestamp_ms()
-            )
-            await websocket.send(encoder.encode(tool_args_event))
-            logger.info(f"Sent: {tool_args_event.type} - '{args_part}'")
-            await asyncio.sleep(0.1)
-
-        # 14. STATE_DELTA - Apply state changes
-        for i, patch_operations in enumerate(state_changes):
-            logger.info(f"=== SENDING STATE_DELTA EVENT {i+1}/{len(state_changes)} ===")
-            
+        await websocket.send(render(frames["tool_call_start"]))
+        logger.info("Sent: %s", EventType.TOOL_CALL_START.value)
+        await pace()
+
+        # 13. TOOL_CALL_ARGS - Tool arguments, sent as one merged delta
+        logger.info("=== SENDING TOOL_CALL_ARGS EVENT ===")
+        await websocket.send(render(frames["tool_call_args"]))
+        logger.info("Sent: %s - '%s'", EventType.TOOL_CALL_ARGS.value, _TOOL_ARGS)
+        await pace()
+
+        # 14. STATE_DELTA - Apply state changes, sent as one group
+        logger.info("=== SENDING %d STATE_DELTA EVENTS ===", len(state_changes))
+        for patch_operations in state_changes:
             # Apply changes to our tracked state
-            current_state = apply_json_patch(current_state, patch_operations)
-            
-            state_delta_event = StateDeltaEvent(
-                type=EventType.STATE_DELTA,
-                delta=patch_operations,
-                timestamp=current_timestamp_ms()
-            )
-            await websocket.send(encoder.encode(state_delta_event))
-            logger.info(f"Sent: {state_delta_event.type} with {len(patch_operations)} operations")
-            await asyncio.sleep(0.1)
+            current_state = apply_json_patch(current_state, patch_operations, in_place=True)
+
+        await _send_group(websocket, frames["state_deltas"], render)
+        for patch_operations in state_changes:
+            logger.info("Sent: %s with %d operations", EventType.STATE_DELTA.value, len(patch_operations))
+        await pace()
 
         # 15. TOOL_CALL_END - Tool execution complete
         logger.info("=== SENDING TOOL_CALL_END EVENT ===")
-        tool_call_end_event = ToolCallEndEvent(
-            type=EventType.TOOL_CALL_END,
-            tool_call_id=tool_call_id,
-            timestamp=current_timestamp_ms()
-        )
-        await websocket.send(encoder.encode(tool_call_end_event))
-        logger.info(f"Sent: {tool_call_end_event.type}")
-        await asyncio.sleep(0.1)
+        await websocket.send(render(frames["tool_call_end"]))
+        logger.info("Sent: %s", EventType.TOOL_CALL_END.value)
+        await pace()
 
-        # 16. TEXT_MESSAGE_CONTENT - Continue with response
-        final_content_parts = [
-            "Based on the weather data, ",
-            "it's currently 68°F in San Francisco ",
-            "with partly cloudy skies and 65% humidity. ",
-            "It's a pleasant day!"
-        ]
-
-        for i, content_part in enumerate(final_content_parts):
-            logger.info(f"=== SENDING TEXT_MESSAGE_CONTENT EVENT (final {i+1}/4) ===")
-            text_content_event = TextMessageContentEvent(
-                type=EventType.TEXT_MESSAGE_CONTENT,
-                message_id=message_id,
-                delta=content_part,
-                timestamp=current_timestamp_ms()
-            )
-            await websocket.send(encoder.encode(text_content_event))
-            logger.info(f"Sent: {text_content_event.type} - '{content_part.strip()}'")
-            await asyncio.sleep(0.1)
+        # 16. TEXT_MESSAGE_CONTENT - Continue with response, sent as one group
+        logger.info("=== SENDING %d FINAL TEXT_MESSAGE_CONTENT EVENTS ===", len(_FINAL_CONTENT_PARTS))
+        await _send_group(websocket, frames["final_content"], render)
+        for content_part in _FINAL_CONTENT_PARTS:
+            logger.info("Sent: %s - '%s'", EventType.TEXT_MESSAGE_CONTENT.value, content_part.strip())
+        await pace()
 
         # 17. TEXT_MESSAGE_END - Complete message assembly
         logger.info("=== SENDING TEXT_MESSAGE_END EVENT ===")
-        text_end_event = TextMessageEndEvent(
-            type=EventType.TEXT_MESSAGE_END,
-            message_id=message_id,
-            timestamp=current_timestamp_ms()
-        )
-        await websocket.send(encoder.encode(text_end_event))
-        logger.info(f"Sent: {text_end_event.type}")
-        await asyncio.sleep(0.1)
+        await websocket.send(render(frames["text_end"]))
+        logger.info("Sent: %s", EventType.TEXT_MESSAGE_END.value)
+        await pace()
 
         # 18. RAW - Raw system event with source attribution
         logger.info("=== SENDING RAW EVENT ===")
-        raw_event = RawEvent(
-            type=EventType.RAW,
-            event={"system": "weather_service", "status": "completed", "response_time_ms": 245},
-            source="weather_api",
-            timestamp=current_timestamp_ms()
-        )
-        await websocket.send(encoder.encode(raw_event))
-        logger.info(f"Sent: {raw_event.type}")
-        await asyncio.sleep(0.1)
+        await websocket.send(render(frames["raw"]))
+        logger.info("Sent: %s", EventType.RAW.value)
+        await pace()
 
         # 19. CUSTOM - Custom application-specific event
         logger.info("=== SENDING CUSTOM EVENT ===")
-        custom_event = CustomEvent(
-            type=EventType.CUSTOM,
-            name="weather_analysis_complete",
-            value={
-                "analysis": {
-                    "location": "San Francisco, CA",
-                    "weather_quality": "good",
-                    "recommendation": "Great day for outdoor activities"
-                },
-                "metadata": {
-                    "analysis_duration_ms": 150,
-                    "confidence": 0.95
-                }
-            },
-            timestamp=current_timestamp_ms()
-        )
-        await websocket.send(encoder.encode(custom_event))
-        logger.info(f"Sent: {custom_event.type}")
-        await asyncio.sleep(0.1)
+        await websocket.send(render(frames["custom"]))
+        logger.info("Sent: %s", EventType.CUSTOM.value)
+        await pace()
 
         # 20. STEP_FINISHED - Complete processing step
         logger.info("=== SENDING STEP_FINISHED EVENT ===")
-        step_finished_event = StepFinishedEvent(
-            type=EventType.STEP_FINISHED,
-            step_name="weather_query_processing",
-            timestamp=current_timestamp_ms()
-        )
-        await websocket.send(encoder.encode(step_finished_event))
-        logger.info(f"Sent: {step_finished_event.type}")
-        await asyncio.sleep(0.1)
+        await websocket.send(render(frames["step_finished"]))
+        logger.info("Sent: %s", EventType.STEP_FINISHED.value)
+        await pace()
 
         # 21. RUN_FINISHED - End of interaction
         logger.info("=== SENDING RUN_FINISHED EVENT ===")
-        run_finished_event = RunFinishedEvent(
-            type=EventType.RUN_FINISHED,
-            thread_id=thread_id,
-            run_id=run_id,
-            timestamp=current_timestamp_ms()
-        )
-        await websocket.send(encoder.encode(run_finished_event))
-        logger.info(f"Sent: {run_finished_event.type}")
-
-        # Summary
-        logger.info("=== COMPREHENSIVE DEMO SUMMARY ===")
-        interaction_count = current_state.get('session', {}).get('interaction_count', 0)
-        logger.info(f"✅ Successfully demonstrated all 21 event types")
-        logger.info(f"✅ Processed {len(sample_messages)} message types")
-        logger.info(f"✅ Applied {len(state_changes)} state transitions")
-        logger.info(f"✅ Total interactions processed: {interaction_count}")
-        
-        # Check that temporary data was cleaned up
-        temp_data = current_state.get('temporary_data', {})
-        if not temp_data:
-            logger.info("✅ Temporary data successfully cleaned up")
-        else:
-            logger.info(f"ℹ️ Remaining temporary data: {list(temp_data.keys())}")
-
-        logger.info("=== COMPREHENSIVE DEMO COMPLETED ===")
-        logger.info(f"Demonstrated 21 different event types with all their parameters")
-        logger.info(f"Applied {len([item for sublist in state_changes for item in sublist])} JSON Patch operations across 7 state transitions")
+        await websocket.send(render(frames["run_finished"]))
+        logger.info("Sent: %s", EventType.RUN_FINISHED.value)
+
+        # Summary (skipped entirely when INFO is filtered out)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("=== COMPREHENSIVE DEMO SUMMARY ===")
+            interaction_count = current_state.get('session', {}).get('interaction_count', 0)
+            logger.info("✅ Successfully demonstrated all 21 event types")
+            logger.info("✅ Processed %d message types", len(_SAMPLE_MESSAGES))
+            logger.info("✅ Applied %d state transitions", len(state_changes))
+            logger.info("✅ Total interactions processed: %s", interaction_count)
+
+            # Check that temporary data was cleaned up
+            temp_data = current_state.get('temporary_data', {})
+            if not temp_data:
+                logger.info("✅ Temporary data successfully cleaned up")
+            else:
+                logger.info("ℹ️ Remaining temporary data: %s", list(temp_data.keys()))
+
+            logger.info("=== COMPREHENSIVE DEMO COMPLETED ===")
+            logger.info("Demonstrated 21 different event types with all their parameters")
+            logger.info("Applied %d JSON Patch operations across %d state transitions", sum(map(len, state_changes)), len(state_changes))
 
     except websockets.exceptions.ConnectionClosedOK:
-        logger.info(f"WebSocket connection for {websocket.remote_address} was closed gracefully during demo.")
+        logger.info("WebSocket connection for %s was closed gracefully during demo.", websocket.remote_address)
     except websockets.exceptions.ConnectionClosedError as e:
-        logger.warning(f"WebSocket connection for {websocket.remote_address} was closed with error during demo: {e}")
+        logger.warning("WebSocket connection for %s was closed with error during demo: %s", websocket.remote_address, e)
     except websockets.exceptions.ConnectionClosed as e:
-        logger.info(f"WebSocket connection for {websocket.remote_address} was closed during demo: {e}")
+        logger.info("WebSocket connection for %s was closed during demo: %s", websocket.remote_address, e)
     except Exception as e:
-        logger.error(f"Error in comprehensive server handler: {e}", exc_info=True)
+        logger.error("Error in comprehensive server handler: %s", e, exc_info=True)
         
         # Send error event if possible
         try:
             error_event = RunErrorEvent(
                 type=EventType.RUN_ERROR,
-                error=str(e),
-                error_code="DEMO_ERROR",
+                message=str(e),
+                code="DEMO_ERROR",
                 timestamp=current_timestamp_ms()
             )
-            await websocket.send(encoder.encode(error_event))
+            await websocket.send(ENCODER.encode(error_event))
         except:
             # If we can't send the error event, just log it
             logger.error("Failed to send error event to client")
 
 async def ag_ui_server_handler(websocket):
     """Simple server handler for basic demo (backward compatibility)."""
-    logger.info(f"Client connected from {websocket.remote_address}")
+    logger.info("Client connected from %s", websocket.remote_address)
 
-    encoder = WebSocketEventEncoder()
+    frames = BASIC_FRAMES
 
-    thread_id = str(uuid.uuid4())
-    run_id = str(uuid.uuid4())
-    message_id = str(uuid.uuid4()) # This will be camelCased to messageId in JSON
+    thread_id = _fast_id()
+    run_id = _fast_id()
+    message_id = _fast_id()
+    render = _renderer(_run_values(thread_id=thread_id, run_id=run_id, message_id=message_id))
 
     try:
         # Send RUN_STARTED event
         logger.info("Sending RUN_STARTED event...")
-        run_started_event = RunStartedEvent(
-            type=EventType.RUN_STARTED, 
-            thread_id=thread_id, 
-            run_id=run_id,
-            timestamp=current_timestamp_ms()
-        )
-        await websocket.send(encoder.encode(run_started_event))
+        await websocket.send(render(frames["run_started"]))
 
         # Wait a bit
         await asyncio.sleep(0.5)
 
         # Send TEXT_MESSAGE_START event
         logger.info("Sending TEXT_MESSAGE_START event...")
-        text_start_event = TextMessageStartEvent(
-            type=EventType.TEXT_MESSAGE_START,
-            message_id=message_id,
-            role="assistant",
-            timestamp=current_timestamp_ms()
-        )
-        await websocket.send(encoder.encode(text_start_event))
+        await websocket.send(render(frames["text_start"]))
 
         # Send some TEXT_MESSAGE_CONTENT events
-        content_parts = ["Hello! ", "This is a ", "streaming message ", "from the AG-UI ", "WebSocket demo."]
-        for part in content_parts:
+        for part, frame in zip(_BASIC_CONTENT_PARTS, frames["text_content"]):
             await asyncio.sleep(0.1)
-            logger.info(f"Sending TEXT_MESSAGE_CONTENT event: '{part.strip()}'")
-            text_content_event = TextMessageContentEvent(
-                type=EventType.TEXT_MESSAGE_CONTENT,
-                message_id=message_id,
-                delta=part,
-                timestamp=current_timestamp_ms()
-            )
-            await websocket.send(encoder.encode(text_content_event))
+            logger.info("Sending TEXT_MESSAGE_CONTENT event: '%s'", part.strip())
+            await websocket.send(render(frame))
 
         # Send TEXT_MESSAGE_END event
         await asyncio.sleep(0.1)
         logger.info("Sending TEXT_MESSAGE_END event...")
-        text_end_event = TextMessageEndEvent(
-            type=EventType.TEXT_MESSAGE_END,
-            message_id=message_id,
-            timestamp=current_timestamp_ms()
-        )
-        await websocket.send(encoder.encode(text_end_event))
+        await websocket.send(render(frames["text_end"]))
 
         # Send RUN_FINISHED event
         await asyncio.sleep(0.5)
         logger.info("Sending RUN_FINISHED event...")
-        run_finished_event = RunFinishedEvent(
-            type=EventType.RUN_FINISHED,
-            thread_id=thread_id,
-            run_id=run_id,
-            timestamp=current_timestamp_ms()
-        )
-        await websocket.send(encoder.encode(run_finished_event))
+        await websocket.send(render(frames["run_finished"]))
 
         logger.info("Demo completed successfully!")
 
     except websockets.exceptions.ConnectionClosedOK:
-        logger.info(f"WebSocket connection for {websocket.remote_address} was closed gracefully during demo.")
+        logger.info("WebSocket connection for %s was closed gracefully during demo.", websocket.remote_address)
     except websockets.exceptions.ConnectionClosedError as e:
-        logger.warning(f"WebSocket connection for {websocket.remote_address} was closed with error during demo: {e}")
+        logger.warning("WebSocket connection for %s was closed with error during demo: %s", websocket.remote_address, e)
     except websockets.exceptions.ConnectionClosed as e:
-        logger.info(f"WebSocket connection for {websocket.remote_address} was closed during demo: {e}")
+        logger.info("WebSocket connection for %s was closed during demo: %s", websocket.remote_address, e)
     except Exception as e:
-        logger.error(f"Error in basic server handler: {e}", exc_info=True)
+        logger.error("Error in basic server handler: %s", e, exc_info=True)
@@ -15,6 +15,11 @@ SECURE_PORT = 8766
 SSL_CERT_PATH = "cert.pem"
 SSL_KEY_PATH = "key.pem"
 
+# SSL contexts, created on first use by get_server_ssl_context() and
+# get_client_ssl_context()
+_server_ssl_context = None
+_client_ssl_context = None
+
 def create_ssl_context():
     """
     Create an SSL context for secure WebSocket connections.
@@ -23,7 +28,7 @@ def create_ssl_context():
         ssl.SSLContext or None: SSL context if certificates are available, None otherwise
     """
     if not (Path(SSL_CERT_PATH).exists() and Path(SSL_KEY_PATH).exists()):
-        logger.warning(f"SSL certificates not found at {SSL_CERT_PATH} and {SSL_KEY_PATH}")
+        logger.warning("SSL certificates not found at %s and %s", SSL_CERT_PATH, SSL_KEY_PATH)
         logger.info("Run 'python generate_ssl_certs.py' to create self-signed certificates for testing")
         return None
     
@@ -33,9 +38,44 @@ def create_ssl_context():
         logger.info("✓ SSL context created successfully")
         return context
     except Exception as e:
-        logger.error(f"Failed to create SSL context: {e}")
+        logger.error("Failed to create SSL context: %s", e)
         return None
 
+def get_server_ssl_context():
+    """
+    Get the SSL context used by the demo servers.
+    
+    The context is created once per process, so the certificate chain is
+    read and parsed only on first use. Nothing is cached while the
+    certificates are missing.
+    
+    Returns:
+        ssl.SSLContext or None: Shared server SSL context, None if unavailable
+    """
+    global _server_ssl_context
+    if _server_ssl_context is None:
+        _server_ssl_context = create_ssl_context()
+    return _server_ssl_context
+
+def get_client_ssl_context():
+    """
+    Get the SSL context used by the demo clients.
+    
+    The context is created once per process and shared by every connection,
+    since setting it up loads the system trust store. Certificate checks are
+    disabled because the demo server uses a self-signed certificate.
+    
+    Returns:
+        ssl.SSLContext: Shared client SSL context
+    """
+    global _client_ssl_context
+    if _client_ssl_context is None:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        _client_ssl_context = context
+    return _client_ssl_context
+
 def get_websocket_uri(secure=True):
     """
     Get the appropriate WebSocket URI based on security preference.
@@ -20,86 +20,83 @@ logger = logging.getLogger("ag_ui_demo")
 
 # Import utilities
 try:
-    from utils.ssl_utils import create_ssl_context, get_websocket_uri, HOST, PORT, SECURE_PORT, should_use_secure_connection
+    from utils.ssl_utils import get_server_ssl_context, get_websocket_uri, HOST, PORT, SECURE_PORT, should_use_secure_connection
     from utils.server_handlers import comprehensive_ag_ui_server_handler, ag_ui_server_handler
     from utils.client_handlers import ag_ui_client, enhanced_ag_ui_client
     from ag_ui.encoder import WebSocketEventEncoder
 except ImportError as e:
-    logger.error(f"Failed to import required modules: {e}")
+    logger.error("Failed to import required modules: %s", e)
     logger.error("Make sure you're running from the correct directory and ag_ui is installed")
     sys.exit(1)
 
-async def start_server_once(secure=True):
-    """Start the basic WebSocket server."""
+# Options shared by every demo server: no permessage-deflate (the clients
+# don't negotiate it either) and a larger write buffer for event bursts.
+# write_limit stays an int: the legacy server (websockets < 14) rejects a
+# (high, low) tuple.
+SERVE_OPTIONS = {
+    "compression": None,
+    "write_limit": 1024 * 1024,
+}
+
+def _serve(handler, label, secure):
+    """
+    Create the WebSocket server for a handler.
+    
+    Args:
+        handler: Connection handler coroutine
+        label: Server description used in log messages
+        secure: Serve wss:// with the shared server SSL context
+        
+    Returns:
+        websockets.Serve or None: Server to enter with 'async with', None if
+        a secure server was requested without SSL certificates
+    """
     if secure:
-        ssl_context = create_ssl_context()
+        ssl_context = get_server_ssl_context()
         if ssl_context is None:
             logger.error("Cannot start secure server without SSL certificates")
             logger.info("Run 'python generate_ssl_certs.py' to create certificates, or use --insecure flag")
-            return
+            return None
         
-        logger.info(f"Starting secure WebSocket server on wss://{HOST}:{SECURE_PORT}")
-        async with websockets.serve(ag_ui_server_handler, HOST, SECURE_PORT, ssl=ssl_context):
-            logger.info("✓ Secure server started successfully")
-            await asyncio.Future()  # Run forever
-    else:
-        logger.warning("Running in insecure mode (for local development only)")
-        logger.info(f"Starting WebSocket server on ws://{HOST}:{PORT}")
-        async with websockets.serve(ag_ui_server_handler, HOST, PORT):
-            logger.info("✓ Insecure server started successfully")
-            await asyncio.Future()  # Run forever
+        logger.info("Starting %s on wss://%s:%s", label, HOST, SECURE_PORT)
+        return websockets.serve(handler, HOST, SECURE_PORT, ssl=ssl_context, **SERVE_OPTIONS)
+
+    logger.warning("Running in insecure mode (for local development only)")
+    logger.info("Starting %s on ws://%s:%s", label, HOST, PORT)
+    return websockets.serve(handler, HOST, PORT, **SERVE_OPTIONS)
+
+async def _run_server(handler, label, secure):
+    """Run a WebSocket server until cancelled."""
+    server = _serve(handler, label, secure)
+    if server is None:
+        return
+    
+    async with server:
+        logger.info("✓ %s started successfully", label)
+        await asyncio.Future()  # Run forever
+
+async def start_server_once(secure=True):
+    """Start the basic WebSocket server."""
+    await _run_server(ag_ui_server_handler, "WebSocket server", secure)
 
 async def start_comprehensive_server_once(secure=True):
     """Start the comprehensive WebSocket server demonstrating ALL event types."""
-    if secure:
-        ssl_context = create_ssl_context()
-        if ssl_context is None:
-            logger.error("Cannot start secure server without SSL certificates")
-            logger.info("Run 'python generate_ssl_certs.py' to create certificates, or use --insecure flag")
-            return
-        
-        logger.info(f"Starting comprehensive secure WebSocket server on wss://{HOST}:{SECURE_PORT}")
-        async with websockets.serve(comprehensive_ag_ui_server_handler, HOST, SECURE_PORT, ssl=ssl_context):
-            logger.info("✓ Comprehensive secure server started successfully")
-            logger.info("🚀 Ready to demonstrate ALL 21 event types")
-            await asyncio.Future()  # Run forever
-    else:
-        logger.warning("Running in insecure mode (for local development only)")
-        logger.info(f"Starting comprehensive WebSocket server on ws://{HOST}:{PORT}")
-        async with websockets.serve(comprehensive_ag_ui_server_handler, HOST, PORT):
-            logger.info("✓ Comprehensive insecure server started successfully")
-            logger.info("🚀 Ready to demonstrate ALL 21 event types")
-            await asyncio.Future()  # Run forever
+    logger.info("🚀 Serving a demonstration of ALL 21 event types")
+    await _run_server(comprehensive_ag_ui_server_handler, "comprehensive WebSocket server", secure)
 
 async def run_basic_demo(secure=True):
     """Run a complete basic demo (server + client)."""
     logger.info("🎬 Starting basic WebSocket demo...")
     
-    # Start server in background
-    if secure:
-        ssl_context = create_ssl_context()
-        if ssl_context is None:
-            logger.error("Cannot run secure demo without SSL certificates")
-            logger.info("Run 'python generate_ssl_certs.py' to create certificates, or use --insecure flag")
-            return
-        
-        server = await websockets.serve(ag_ui_server_handler, HOST, SECURE_PORT, ssl=ssl_context)
-        logger.info(f"✓ Basic demo server started on wss://{HOST}:{SECURE_PORT}")
-    else:
-        logger.warning("Running demo in insecure mode (for local development only)")
-        server = await websockets.serve(ag_ui_server_handler, HOST, PORT)
-        logger.info(f"✓ Basic demo server started on ws://{HOST}:{PORT}")
-    
-    # Wait a moment for server to be ready
-    await asyncio.sleep(0.5)
-    
-    # Run client
-    logger.info("🔌 Starting basic demo client...")
-    await ag_ui_client(secure)
+    server = _serve(ag_ui_server_handler, "basic demo server", secure)
+    if server is None:
+        return
     
-    # Close server
-    server.close()
-    await server.wait_closed()
+    # The server is closed on exit from the block, even if the client fails
+    async with server:
+        # Run client
+        logger.info("🔌 Starting basic demo client...")
+        await ag_ui_client(secure)
     logger.info("🎬 Basic demo completed!")
 
 async def run_comprehensive_demo(secure=True):
@@ -107,31 +104,15 @@ async def run_comprehensive_demo(secure=True):
     logger.info("🎬 Starting COMPREHENSIVE WebSocket demo...")
     logger.info("🚀 This demo will showcase ALL 21 event types!")
     
-    # Start comprehensive server in background
-    if secure:
-        ssl_context = create_ssl_context()
-        if ssl_context is None:
-            logger.error("Cannot run secure demo without SSL certificates")
-            logger.info("Run 'python generate_ssl_certs.py' to create certificates, or use --insecure flag")
-            return
-        
-        server = await websockets.serve(comprehensive_ag_ui_server_handler, HOST, SECURE_PORT, ssl=ssl_context)
-        logger.info(f"✓ Comprehensive demo server started on wss://{HOST}:{SECURE_PORT}")
-    else:
-        logger.warning("Running demo in insecure mode (for local development only)")
-        server = await websockets.serve(comprehensive_ag_ui_server_handler, HOST, PORT)
-        logger.info(f"✓ Comprehensive demo server started on ws://{HOST}:{PORT}")
-    
-    # Wait a moment for server to be ready
-    await asyncio.sleep(0.5)
-    
-    # Run enhanced client
-    logger.info("🔍 Starting comprehensive demo client...")
-    await enhanced_ag_ui_client(secure)
+    server = _serve(comprehensive_ag_ui_server_handler, "comprehensive demo server", secure)
+    if server is None:
+        return
     
-    # Close server
-    server.close()
-    await server.wait_closed()
+    # The server is closed on exit from the block, even if the client fails
+    async with server:
+        # Run enhanced client
+        logger.info("🔍 Starting comprehensive demo client...")
+        await enhanced_ag_ui_client(secure)
     logger.info("🎬 COMPREHENSIVE demo completed!")
 
 def print_usage(script_name=None):
@@ -232,13 +213,20 @@ async def main():
             print_usage()
             
         else:
-            logger.error(f"Unknown command: {command}")
+            logger.error("Unknown command: %s", command)
             print_usage()
             
     except KeyboardInterrupt:
         logger.info("Demo interrupted by user")
     except Exception as e:
-        logger.error(f"Demo failed: {e}", exc_info=True)
+        logger.error("Demo failed: %s", e, exc_info=True)
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # Run on uvloop when it is installed; it is optional and not available on
+    # Windows. uvloop.run() only exists from uvloop 0.18 on.
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
+    run = getattr(uvloop, "run", None) or asyncio.run
+    run(main())
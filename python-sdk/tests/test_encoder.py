@@ -1,22 +1,65 @@
 import unittest
 import json
-from datetime import datetime
+import time
+from pydantic import TypeAdapter, ValidationError
 
 from ag_ui.encoder import EventEncoder, WebSocketEventEncoder, AGUI_MEDIA_TYPE
-from ag_ui.core.events import BaseEvent, EventType, TextMessageContentEvent, ToolCallStartEvent
+from ag_ui.core.events import (
+    BaseEvent,
+    EventType,
+    TextMessageContentEvent,
+    ToolCallStartEvent,
+    ThinkingStartEvent,
+    ThinkingTextMessageContentEvent,
+    ThinkingEndEvent,
+    StateSnapshotEvent,
+    StateDeltaEvent,
+    MessagesSnapshotEvent,
+    RawEvent,
+    CustomEvent,
+    RunStartedEvent,
+    RunErrorEvent,
+    StepStartedEvent,
+)
+from ag_ui.core.types import UserMessage
+
+
+_TEXT_CONTENT_ADAPTER = TypeAdapter(TextMessageContentEvent)
+
+
+def _sse_payload(encoded):
+    """Return the JSON payload of an SSE frame (strip "data: " and "\n\n")"""
+    return encoded[6:-2]
 
 
 class TestEventEncoder(unittest.TestCase):
     """Test suite for EventEncoder class (SSE-only)"""
 
+    @classmethod
+    def setUpClass(cls):
+        """Build the shared (read-only) event fixtures once"""
+        cls.text_event = TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id="msg_123",
+            delta="Hello, world!",
+            timestamp=1648214400000
+        )
+        cls.tool_event = ToolCallStartEvent(
+            type=EventType.TOOL_CALL_START,
+            tool_call_id="tool_789",
+            tool_call_name="get_weather",
+            timestamp=1648214400000
+        )
+        cls.base_event = BaseEvent(type=EventType.RAW, timestamp=1648214400000)
+
     def test_encoder_initialization(self):
         """Test initializing an EventEncoder"""
         encoder = EventEncoder()
-        self.assertIsInstance(encoder, EventEncoder)
+        self.assertEqual(encoder.get_content_type(), "text/event-stream")
         
         # Test with accept parameter
         encoder_with_accept = EventEncoder(accept="text/event-stream")
-        self.assertIsInstance(encoder_with_accept, EventEncoder)
+        self.assertEqual(encoder_with_accept.get_content_type(), "text/event-stream")
 
     def test_get_content_type_sse(self):
         """Test get_content_type returns SSE content type"""
@@ -27,7 +70,7 @@ class TestEventEncoder(unittest.TestCase):
     def test_encode_method_sse(self):
         """Test the encode method for SSE"""
         # Create a test event
-        timestamp = int(datetime.now().timestamp() * 1000)
+        timestamp = time.time_ns() // 1_000_000
         event = BaseEvent(type=EventType.RAW, timestamp=timestamp)
         
         # Create encoder and encode event
@@ -44,22 +87,15 @@ class TestEventEncoder(unittest.TestCase):
 
     def test_encode_sse_method_direct(self):
         """Test the _encode_sse method directly"""
-        event = TextMessageContentEvent(
-            type=EventType.TEXT_MESSAGE_CONTENT,
-            message_id="msg_123",
-            delta="Hello, world!",
-            timestamp=1648214400000
-        )
-        
         encoder = EventEncoder()
-        encoded = encoder._encode_sse(event)
+        encoded = encoder._encode_sse(self.text_event)
         
         # Check that it's properly formatted for SSE
         self.assertTrue(encoded.startswith("data: "))
         self.assertTrue(encoded.endswith("\n\n"))
         
         # Parse the JSON part
-        json_part = encoded[6:-2]  # Remove "data: " and "\n\n"
+        json_part = _sse_payload(encoded)
         parsed = json.loads(json_part)
         
         self.assertEqual(parsed["type"], "TEXT_MESSAGE_CONTENT")
@@ -67,87 +103,124 @@ class TestEventEncoder(unittest.TestCase):
         self.assertEqual(parsed["delta"], "Hello, world!")
         self.assertEqual(parsed["timestamp"], 1648214400000)
 
-    def test_encode_with_different_event_types_sse(self):
-        """Test encoding different types of events using SSE"""
-        encoder = EventEncoder()
-        
-        # Test with TextMessageContentEvent
-        text_event = TextMessageContentEvent(
+    def test_encode_bytes_sse(self):
+        """Test that encode_bytes produces the SSE frame as UTF-8 bytes"""
+        event = TextMessageContentEvent(
             type=EventType.TEXT_MESSAGE_CONTENT,
-            message_id="msg_456",
-            delta="Test message",
+            message_id="msg_123",
+            delta="Héllo, wörld!",
             timestamp=1648214400000
         )
-        encoded_text = encoder.encode(text_event)
-        self.assertIn('"type":"TEXT_MESSAGE_CONTENT"', encoded_text)
+
+        encoder = EventEncoder()
+        encoded = encoder.encode_bytes(event)
+
+        self.assertIsInstance(encoded, bytes)
+        self.assertEqual(encoded, encoder.encode(event).encode('utf-8'))
+
+    def test_encode_iter_sse(self):
+        """Test that encode_iter yields one SSE byte frame per event"""
+        events = [
+            TextMessageContentEvent(
+                type=EventType.TEXT_MESSAGE_CONTENT,
+                message_id="msg_123",
+                delta=delta,
+                timestamp=1648214400000
+            )
+            for delta in ("Hello", ", ", "world!")
+        ]
+
+        encoder = EventEncoder()
+        frames = list(encoder.encode_iter(events))
+
+        self.assertEqual(frames, [encoder.encode_bytes(event) for event in events])
+
+    def test_encode_many_sse(self):
+        """Test that encode_many concatenates the SSE frames of a batch"""
+        events = [self.base_event, self.text_event, self.tool_event]
+
+        encoder = EventEncoder()
+        encoded = encoder.encode_many(events)
+
+        self.assertEqual(encoded, "".join(encoder.encode(event) for event in events).encode('utf-8'))
+        self.assertEqual(encoder.encode_many([]), b"")
+
+    def test_encode_with_different_event_types_sse(self):
+        """Test encoding different types of events using SSE"""
+        encoder = EventEncoder()
         
-        # Test with ToolCallStartEvent
-        tool_event = ToolCallStartEvent(
-            type=EventType.TOOL_CALL_START,
-            tool_call_id="tool_789",
-            tool_call_name="get_weather",
-            timestamp=1648214400000
-        )
-        encoded_tool = encoder.encode(tool_event)
-        self.assertIn('"type":"TOOL_CALL_START"', encoded_tool)
+        cases = [
+            (self.text_event, {"type": "TEXT_MESSAGE_CONTENT", "messageId": "msg_123", "delta": "Hello, world!"}),
+            (self.tool_event, {"type": "TOOL_CALL_START", "toolCallId": "tool_789", "toolCallName": "get_weather"}),
+            (self.base_event, {"type": "RAW", "timestamp": 1648214400000}),
+        ]
+        
+        for event, expected_fields in cases:
+            with self.subTest(event_type=event.type):
+                parsed = json.loads(_sse_payload(encoder.encode(event)))
+                for key, value in expected_fields.items():
+                    self.assertEqual(parsed[key], value)
 
     def test_null_value_exclusion_sse(self):
         """Test that fields with None values are excluded from JSON output for SSE"""
         encoder = EventEncoder()
         
-        # Create event with optional fields
-        event = BaseEvent(
-            type=EventType.RAW,
-            timestamp=1648214400000
-        )
-        
-        encoded = encoder.encode(event)
-        json_part = encoded[6:-2]  # Remove "data: " and "\n\n"
+        encoded = encoder.encode(self.base_event)
+        json_part = _sse_payload(encoded)
         parsed = json.loads(json_part)
         
         # Check that only non-None fields are present
-        self.assertIn("type", parsed)
-        self.assertIn("timestamp", parsed)
+        self.assertEqual(parsed.keys(), {"type", "timestamp"})
 
     def test_round_trip_serialization(self):
         """Test that events can be serialized to JSON with camelCase and deserialized back correctly"""
         encoder = EventEncoder()
-        
-        original_event = TextMessageContentEvent(
-            type=EventType.TEXT_MESSAGE_CONTENT,
-            message_id="test_123",
-            delta="Test content",
-            timestamp=1648214400000
-        )
+        original_event = self.text_event
         
         # Encode to SSE format
         encoded = encoder.encode(original_event)
         
         # Extract JSON from SSE format
-        json_part = encoded[6:-2]  # Remove "data: " and "\n\n"
+        json_part = _sse_payload(encoded)
         
         # Parse JSON and verify camelCase
         parsed = json.loads(json_part)
-        self.assertEqual(parsed["messageId"], "test_123")  # camelCase
+        self.assertEqual(parsed["messageId"], "msg_123")  # camelCase
         self.assertNotIn("message_id", parsed)  # No snake_case
         
         # Verify round-trip
-        recreated_event = TextMessageContentEvent.model_validate(parsed)
-        self.assertEqual(recreated_event.message_id, original_event.message_id)
-        self.assertEqual(recreated_event.delta, original_event.delta)
+        recreated_event = _TEXT_CONTENT_ADAPTER.validate_json(json_part)
+        self.assertEqual(recreated_event, original_event)
 
 
 class TestWebSocketEventEncoder(unittest.TestCase):
     """Test suite for WebSocketEventEncoder class"""
 
+    @classmethod
+    def setUpClass(cls):
+        """Build the shared (read-only) event fixtures once"""
+        cls.text_event = TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id="ws_msg_123",
+            delta="WebSocket message",
+            timestamp=1648214400000
+        )
+        cls.tool_event = ToolCallStartEvent(
+            type=EventType.TOOL_CALL_START,
+            tool_call_id="tool_789",
+            tool_call_name="get_weather",
+            timestamp=1648214400000
+        )
+        cls.base_event = BaseEvent(type=EventType.RAW, timestamp=1648214400000)
+
     def test_websocket_encoder_initialization(self):
         """Test initializing a WebSocketEventEncoder"""
         encoder = WebSocketEventEncoder()
-        self.assertIsInstance(encoder, WebSocketEventEncoder)
+        self.assertEqual(encoder.get_content_type(), "application/json")
         
         # Test with accept parameter
         encoder_with_accept = WebSocketEventEncoder(accept="application/json")
-        self.assertIsInstance(encoder_with_accept, WebSocketEventEncoder)
+        self.assertEqual(encoder_with_accept.get_content_type(), "application/json")
 
     def test_websocket_get_content_type(self):
         """Test get_content_type for WebSocket encoder"""
@@ -158,15 +231,10 @@ class TestWebSocketEventEncoder(unittest.TestCase):
     def test_websocket_encode_method(self):
         """Test the encode() method for WebSocket encoder"""
         encoder = WebSocketEventEncoder()
-        
-        event = TextMessageContentEvent(
-            type=EventType.TEXT_MESSAGE_CONTENT,
-            message_id="ws_msg_123",
-            delta="WebSocket message",
-            timestamp=1648214400000
-        )
+        event = self.text_event
         
         encoded = encoder.encode(event)
+        self.assertEqual(encoded, event.model_dump_json(by_alias=True, exclude_none=True))
         
         # Should be pure JSON without SSE formatting
         self.assertFalse(encoded.startswith("data: "))
@@ -181,11 +249,7 @@ class TestWebSocketEventEncoder(unittest.TestCase):
     def test_websocket_encode_binary(self):
         """Test binary encoding for WebSocket"""
         encoder = WebSocketEventEncoder()
-        
-        event = BaseEvent(
-            type=EventType.RAW,
-            timestamp=1648214400000
-        )
+        event = self.base_event
         
         binary_encoded = encoder.encode_binary(event)
         self.assertIsInstance(binary_encoded, bytes)
@@ -194,6 +258,56 @@ class TestWebSocketEventEncoder(unittest.TestCase):
         json_encoded = encoder.encode(event)
         self.assertEqual(binary_encoded, json_encoded.encode('utf-8'))
 
+    def test_websocket_encode_iter(self):
+        """Test that encode_iter yields one binary payload per event"""
+        encoder = WebSocketEventEncoder()
+
+        events = [self.base_event, self.text_event, self.tool_event]
+
+        payloads = list(encoder.encode_iter(events))
+        self.assertEqual(payloads, [encoder.encode_binary(event) for event in events])
+
+    def test_websocket_decode_round_trip(self):
+        """Test that decode() restores the encoded event with its concrete type"""
+        encoder = WebSocketEventEncoder()
+
+        # At least one event of every family, including the THINKING_* events
+        events = [
+            self.text_event,
+            self.tool_event,
+            ThinkingStartEvent(type=EventType.THINKING_START, title="Checking the weather"),
+            ThinkingTextMessageContentEvent(type=EventType.THINKING_TEXT_MESSAGE_CONTENT, delta="Hmm"),
+            ThinkingEndEvent(type=EventType.THINKING_END),
+            StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot={"count": 1}),
+            StateDeltaEvent(
+                type=EventType.STATE_DELTA,
+                delta=[{"op": "replace", "path": "/count", "value": 2}]
+            ),
+            MessagesSnapshotEvent(
+                type=EventType.MESSAGES_SNAPSHOT,
+                messages=[UserMessage(id="user_1", role="user", content="Hello")]
+            ),
+            RawEvent(type=EventType.RAW, event={"status": "ok"}, source="test"),
+            CustomEvent(type=EventType.CUSTOM, name="metric", value={"score": 0.95}),
+            RunStartedEvent(type=EventType.RUN_STARTED, thread_id="thread_1", run_id="run_1"),
+            RunErrorEvent(type=EventType.RUN_ERROR, message="Boom", code="DEMO_ERROR"),
+            StepStartedEvent(type=EventType.STEP_STARTED, step_name="lookup"),
+        ]
+
+        for event in events:
+            with self.subTest(event_type=event.type):
+                decoded = encoder.decode(encoder.encode_binary(event))
+                self.assertIs(type(decoded), type(event))
+                self.assertEqual(decoded, event)
+                self.assertEqual(encoder.decode(encoder.encode(event)), event)
+
+    def test_websocket_decode_invalid_payload(self):
+        """Test that decode() rejects payloads that are not events"""
+        encoder = WebSocketEventEncoder()
+
+        with self.assertRaises(ValidationError):
+            encoder.decode(b'{"type":"TEXT_MESSAGE_CONTENT","messageId":"m"}')
+
     def test_websocket_can_compress(self):
         """Test compression capability indication"""
         encoder = WebSocketEventEncoder()
@@ -203,17 +317,11 @@ class TestWebSocketEventEncoder(unittest.TestCase):
         """Test WebSocket encoding with optional fields set to None"""
         encoder = WebSocketEventEncoder()
         
-        event = BaseEvent(
-            type=EventType.RAW,
-            timestamp=1648214400000
-        )
-        
-        encoded = encoder.encode(event)
+        encoded = encoder.encode(self.base_event)
         parsed = json.loads(encoded)
         
         # Check that only non-None fields are present
-        self.assertIn("type", parsed)
-        self.assertIn("timestamp", parsed)
+        self.assertEqual(parsed.keys(), {"type", "timestamp"})
 
 
 class TestEventEncoderComparison(unittest.TestCase):
@@ -236,7 +344,7 @@ class TestEventEncoderComparison(unittest.TestCase):
         ws_encoded = ws_encoder.encode(event)
         
         # Extract JSON from SSE format
-        sse_json = sse_encoded[6:-2]  # Remove "data: " and "\n\n"
+        sse_json = _sse_payload(sse_encoded)
         
         # Should be the same JSON content
         self.assertEqual(sse_json, ws_encoded)